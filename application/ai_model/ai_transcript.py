@@ -1,11 +1,11 @@
 import sounddevice as sd
-import scipy.io.wavfile as wav
 import numpy as np
 import threading
-import io
+import time
 import os
 from dotenv import load_dotenv
 from google.cloud.speech_v2 import SpeechClient
+from google.cloud.speech_v2.services.speech.transports import SpeechGrpcTransport
 from google.cloud.speech_v2.types import cloud_speech
 
 
@@ -25,71 +25,132 @@ PROJECT_ID = "project-93f4a126-e6c4-4f37-aab"
 REGION = "us-central1"
 RATE = 16000 
 LANGUAGES = ["en-US", "nl-NL", "de-DE"]
+RECOGNIZER = f"projects/{PROJECT_ID}/locations/{REGION}/recognizers/_"
+
+# Same config for every recording, so it is built once
+STREAMING_CONFIG = cloud_speech.StreamingRecognitionConfig(
+    config=cloud_speech.RecognitionConfig(
+        explicit_decoding_config=cloud_speech.ExplicitDecodingConfig(
+            encoding=cloud_speech.ExplicitDecodingConfig.AudioEncoding.LINEAR16,
+            sample_rate_hertz=RATE,
+            audio_channel_count=1,
+        ),
+        language_codes=LANGUAGES,
+        model="long",
+        features=cloud_speech.RecognitionFeatures(enable_automatic_punctuation=True),
+    ),
+    streaming_features=cloud_speech.StreamingRecognitionFeatures(interim_results=True),
+)
+# Client automatically looks for GOOGLE_APPLICATION_CREDENTIALS from .env
+# Created once so every recording reuses the same gRPC channel, pinned to the regional endpoint
+# with keepalive pings so the connection stays warm between recordings
+ENDPOINT = f"{REGION}-speech.googleapis.com"
+channel = SpeechGrpcTransport.create_channel(
+    f"{ENDPOINT}:443",
+    options=[
+        ("grpc.keepalive_time_ms", 30000),
+        ("grpc.keepalive_timeout_ms", 10000),
+        ("grpc.http2.max_pings_without_data", 0),
+        ("grpc.keepalive_permit_without_calls", 1),
+    ],
+)
+client = SpeechClient(transport=SpeechGrpcTransport(host=ENDPOINT, channel=channel))
+MAX_SECONDS = 600
+# A single StreamingRecognize stream is capped in length, so longer recordings roll over to a new one
+STREAM_SECONDS = 240
 recording_event = threading.Event()
-audio_data = [] # Stores audio samples
+# Pre-allocated capture buffer: the callback only copies into it, no lock and no allocation per block
+audio_buf = np.empty(RATE * MAX_SECONDS, dtype=np.int16)
+write_idx = 0
+stop_idx = None # Set on stop so the stream knows where the recording ends
+read_idx = 0 # Next sample to send; carried over when a stream rolls over
 
 def audio_callback(indata, frames, time, status):
     """Continuous audio capture to prevent cuts."""
+    global write_idx
     if recording_event.is_set():
-        audio_data.append(indata.copy())
-
-def transcribe_audio():
-    if not audio_data:
-        print("⚠️ No audio recorded")
-        return
+        end = min(write_idx + frames, len(audio_buf))
+        audio_buf[write_idx:end] = indata[:end - write_idx, 0]
+        write_idx = end
 
-    print("📝 Transcribing with V2 (Chirp)...")
-    
-    # Merge all captured data smoothly
-    full_audio = np.concatenate(audio_data, axis=0)
-    
-    # Convert to bytes in memory
-    byte_io = io.BytesIO()
-    wav.write(byte_io, RATE, full_audio)
-    audio_bytes = byte_io.getvalue()
+def recording_sent():
+    return stop_idx is not None and read_idx >= stop_idx
 
-    try:
-        # Client automatically looks for GOOGLE_APPLICATION_CREDENTIALS from .env
-        client = SpeechClient()
-        parent = f"projects/{PROJECT_ID}/locations/{REGION}"
+def request_stream():
+    # First request carries the config, every following one a block of raw audio
+    global read_idx
+    yield cloud_speech.StreamingRecognizeRequest(
+        recognizer=RECOGNIZER,
+        streaming_config=STREAMING_CONFIG,
+    )
+    stream_end = read_idx + RATE * STREAM_SECONDS
+    while read_idx < stream_end:
+        limit = write_idx if stop_idx is None else stop_idx
+        if read_idx >= limit:
+            if stop_idx is not None:
+                return
+            time.sleep(0.02)
+            continue
+        # At most 100 ms per request
+        end = min(limit, read_idx + RATE // 10, stream_end)
+        yield cloud_speech.StreamingRecognizeRequest(audio=audio_buf[read_idx:end].tobytes())
+        read_idx = end
 
-        config = cloud_speech.RecognitionConfig(
-            auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
-            language_codes=LANGUAGES,
-            model="long", 
-            features=cloud_speech.RecognitionFeatures(enable_automatic_punctuation=True),
-        )
+def transcribe_stream():
+    print("📝 Streaming to V2 (Chirp)...")
 
-        request = cloud_speech.RecognizeRequest(
-            recognizer=f"projects/{PROJECT_ID}/locations/global/recognizers/_",
-            config=config,
-            content=audio_bytes,
-        )
+    try:
+        # One stream per STREAM_SECONDS of audio, until the whole recording has been sent
+        while not recording_sent():
+            responses = client.streaming_recognize(requests=request_stream())
 
-        response = client.recognize(request=request)
-        
-        print("\n" + "="*30)
-        print("📝 FINAL TRANSCRIPT:")
-        for result in response.results:
-            print(f"[{result.language_code}]: {result.alternatives[0].transcript}")
-        print("="*30 + "\n")
+            # Partial results overwrite the current line, final results are printed as they arrive
+            for response in responses:
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    text = result.alternatives[0].transcript
+                    if result.is_final:
+                        print(f"\r[{result.language_code}]: {text}", flush=True)
+                    else:
+                        print(f"\r... {text}", end="", flush=True)
     except Exception as e:
         print(f"❌ API Error: {e}")
 
+def warm_client():
+    # Any request opens the connection, so the first recording skips the TLS handshake
+    try:
+        client.get_recognizer(name=RECOGNIZER)
+    except Exception:
+        pass
+
 def keyboard_listener():
+    global write_idx, stop_idx, read_idx
+    threading.Thread(target=warm_client, daemon=True).start()
     # Use InputStream for zero-latency continuous recording
-    with sd.InputStream(samplerate=RATE, channels=1, dtype='int16', callback=audio_callback):
+    # Fixed 20 ms blocks: fewer, evenly sized callbacks than PortAudio's variable default
+    with sd.InputStream(samplerate=RATE, blocksize=RATE // 50, channels=1, dtype='int16', callback=audio_callback):
         print("Press ENTER to start / stop recording")
+        stream_thread = None
         while True:
             input()
             if not recording_event.is_set():
                 print("🔴 Recording... ")
-                audio_data.clear()
+                write_idx = 0
+                read_idx = 0
+                stop_idx = None
                 recording_event.set()
+                stream_thread = threading.Thread(target=transcribe_stream, daemon=True)
+                stream_thread.start()
             else:
                 recording_event.clear()
                 print("⏹️ Stopped")
-                transcribe_audio()
+                if write_idx >= len(audio_buf):
+                    print(f"⚠️ Recording longer than {MAX_SECONDS}s was cut off")
+                # End-of-stream only; the final transcript is already on its way
+                stop_idx = write_idx
+                stream_thread.join()
+                print("="*30 + "\n")
 
 if __name__ == "__main__":
     keyboard_listener()
\ No newline at end of file
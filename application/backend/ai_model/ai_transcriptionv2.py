@@ -1,128 +1,509 @@
 import base64
+import collections
+import concurrent.futures
+import hashlib
 import io
 import json
+import math
 import os
+import queue
 import threading
 import re
+import time
+import uuid
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any, Dict, Optional
 
 import numpy as np
 import sounddevice as sd
-import scipy.io.wavfile as wav
 from dotenv import load_dotenv
 import google.generativeai as genai
 from google.cloud.speech_v2 import SpeechClient
+from google.cloud.speech_v2.services.speech.transports import SpeechGrpcTransport
 from google.cloud.speech_v2.types import cloud_speech
 
+try:
+    import orjson
+except ImportError:
+    # Without orjson, request and response bodies go through the stdlib json module.
+    orjson = None
+
+try:
+    import soundfile as sf
+except (ImportError, OSError):
+    # Without soundfile/libsndfile, uploads fall back to raw LINEAR16.
+    sf = None
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 # Load backend-specific environment variables.
-load_dotenv(os.path.join(os.path.dirname(__file__), ".env"), override=True)
+load_dotenv(os.path.join(MODULE_DIR, ".env"), override=True)
+
+
+def _env(*names: str, default: str) -> str:
+    # First non-blank variable wins, so aliases like GOOGLE_REGION/REGION resolve in one place.
+    for name in names:
+        value = os.getenv(name)
+        if value and value.strip():
+            return value.strip()
+    return default
+
 
-DEFAULT_KEY_PATH = os.path.join(os.path.dirname(__file__), "google_key.json")
+def _env_flag(name: str, default: bool) -> bool:
+    return _env(name, default="true" if default else "false").lower() not in ("0", "false", "no")
+
+
+DEFAULT_KEY_PATH = os.path.join(MODULE_DIR, "google_key.json")
 # Resolve Google credentials, falling back to a local key file when needed.
-credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+credentials_path = _env("GOOGLE_APPLICATION_CREDENTIALS", default="")
 if credentials_path and not os.path.exists(credentials_path):
     print(f"Credentials file not found at {credentials_path}; falling back to {DEFAULT_KEY_PATH}", flush=True)
     credentials_path = None
 if not credentials_path and os.path.exists(DEFAULT_KEY_PATH):
     os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = DEFAULT_KEY_PATH
 
-project_env = os.getenv("GOOGLE_PROJECT_ID") or os.getenv("PROJECT_ID")
-PROJECT_ID = project_env.strip() if project_env else "project-93f4a126-e6c4-4f37-aab"
-
-region_env = os.getenv("GOOGLE_REGION") or os.getenv("REGION")
-REGION = region_env.strip() if region_env else "us-central1"
-
-rate_env = os.getenv("AUDIO_SAMPLE_RATE") or os.getenv("SAMPLING_RATE") or os.getenv("RATE")
-RATE = int(rate_env.strip()) if rate_env else 16000
+PROJECT_ID = _env("GOOGLE_PROJECT_ID", "PROJECT_ID", default="project-93f4a126-e6c4-4f37-aab")
+REGION = _env("GOOGLE_REGION", "REGION", default="us-central1")
+
+# Recognize against the regional endpoint instead of routing through the global one.
+SPEECH_LOCATION = _env("SPEECH_LOCATION", default=REGION)
+SPEECH_ENDPOINT = (
+    "speech.googleapis.com" if SPEECH_LOCATION == "global" else f"{SPEECH_LOCATION}-speech.googleapis.com"
+)
+RECOGNIZER = f"projects/{PROJECT_ID}/locations/{SPEECH_LOCATION}/recognizers/_"
+
+# Speech models work on 16 kHz audio; anything above that only makes uploads bigger.
+STT_MAX_RATE = 16000
+# Rate assumed for uploads that do not state one; audio is resampled to RATE before recognition.
+AUDIO_SAMPLE_RATE = int(_env("AUDIO_SAMPLE_RATE", "SAMPLING_RATE", "RATE", default=str(STT_MAX_RATE)))
+RATE = min(AUDIO_SAMPLE_RATE, STT_MAX_RATE)
 LANGUAGES = [
     lang.strip()
-    for lang in os.getenv("TRANSCRIPTION_LANGUAGES", "en-US,nl-NL,de-DE").split(",")
+    for lang in _env("TRANSCRIPTION_LANGUAGES", default="en-US,nl-NL,de-DE").split(",")
     if lang.strip()
 ]
-MODEL = os.getenv("TRANSCRIPTION_MODEL", "long")
-TRANSCRIPTION_CHUNK_SECONDS = int(os.getenv("TRANSCRIPTION_CHUNK_SECONDS", "55"))
-
-SUMMARY_API_KEY = os.getenv("GOOGLE_SUMMARY_KEY") or os.getenv("GOOGLE_AI_API_KEY")
-SUMMARY_MODEL = os.getenv("SUMMARY_MODEL", "models/gemini-2.5-flash")
-SUMMARY_FALLBACK_MODEL = os.getenv("SUMMARY_FALLBACK_MODEL", "models/gemini-2.5-flash")
-SUMMARY_TEMPERATURE = float(os.getenv("SUMMARY_TEMPERATURE", "0.3"))
-SUMMARY_MAX_OUTPUT_TOKENS = int(os.getenv("SUMMARY_MAX_OUTPUT_TOKENS", "2400"))
-SUMMARY_CONTINUE_MAX_OUTPUT_TOKENS = int(os.getenv("SUMMARY_CONTINUE_MAX_OUTPUT_TOKENS", "800"))
-SUMMARY_CHUNK_CHARS = int(os.getenv("SUMMARY_CHUNK_CHARS", "12000"))
-TITLE_MODEL = os.getenv("TITLE_MODEL", SUMMARY_MODEL)
-TITLE_FALLBACK_MODEL = os.getenv("TITLE_FALLBACK_MODEL", SUMMARY_MODEL)
-TITLE_TEMPERATURE = float(os.getenv("TITLE_TEMPERATURE", "0.4"))
-TITLE_MAX_OUTPUT_TOKENS = int(os.getenv("TITLE_MAX_OUTPUT_TOKENS", "24"))
+MODEL = _env("TRANSCRIPTION_MODEL", default="long")
+TRANSCRIPTION_CHUNK_SECONDS = int(_env("TRANSCRIPTION_CHUNK_SECONDS", default="55"))
+# Chunk cuts move back by up to this many seconds to land in a pause instead of mid-word.
+TRANSCRIPTION_SPLIT_SEARCH_SECONDS = float(_env("TRANSCRIPTION_SPLIT_SEARCH_SECONDS", default="5"))
+RECOGNIZE_WORKERS = int(_env("RECOGNIZE_WORKERS", default="4"))
+# Mean absolute int16 amplitude below which audio is treated as silence and never sent to STT.
+SILENCE_THRESHOLD = float(_env("SILENCE_THRESHOLD", default="100"))
+# Quiet frames further than this from any voiced frame are cut before upload (shorter pauses are kept).
+SILENCE_PADDING_SECONDS = float(_env("SILENCE_PADDING_SECONDS", default="0.3"))
+TRANSCRIPTION_UPLOAD_FLAC = _env_flag("TRANSCRIPTION_UPLOAD_FLAC", True)
+STREAMING_MODEL = _env("STREAMING_MODEL", default=MODEL)
+STREAMING_INTERIM_RESULTS = _env_flag("STREAMING_INTERIM_RESULTS", True)
+# StreamingRecognize caps a single stream's duration, so long recordings roll over to a new stream.
+STREAMING_RESTART_SECONDS = int(_env("STREAMING_RESTART_SECONDS", default="240"))
+STREAMING_STOP_TIMEOUT = float(_env("STREAMING_STOP_TIMEOUT", default="15"))
+STREAMING_POLL_SECONDS = float(_env("STREAMING_POLL_SECONDS", default="0.05"))
+STREAMING_EVENT_POLL_SECONDS = float(_env("STREAMING_EVENT_POLL_SECONDS", default="1"))
+STREAMING_CHUNK_FRAMES = RATE // 10
+# The capture buffer starts at RECORDING_BUFFER_SECONDS and doubles once it is RECORDING_GROW_AT full,
+# up to RECORDING_MAX_SECONDS (0 = no limit).
+RECORDING_BUFFER_SECONDS = int(_env("RECORDING_BUFFER_SECONDS", default="600"))
+RECORDING_MAX_SECONDS = int(_env("RECORDING_MAX_SECONDS", default="0"))
+RECORDING_GROW_AT = 0.75
+# Fixed-size callbacks instead of PortAudio's variable default keep per-callback overhead predictable.
+CAPTURE_BLOCK_MS = int(_env("CAPTURE_BLOCK_MS", default="20"))
+JOB_WORKERS = int(_env("JOB_WORKERS", default="4"))
+# Finished jobs that nobody polls are dropped after this long.
+JOB_RESULT_TTL_SECONDS = float(_env("JOB_RESULT_TTL_SECONDS", default="900"))
+HTTP_TIMEOUT = float(_env("HTTP_TIMEOUT", default="30"))
+
+SUMMARY_API_KEY = _env("GOOGLE_SUMMARY_KEY", "GOOGLE_AI_API_KEY", default="")
+SUMMARY_MODEL = _env("SUMMARY_MODEL", default="models/gemini-2.5-flash")
+SUMMARY_FALLBACK_MODEL = _env("SUMMARY_FALLBACK_MODEL", default="models/gemini-2.5-flash")
+SUMMARY_TEMPERATURE = float(_env("SUMMARY_TEMPERATURE", default="0.3"))
+SUMMARY_MAX_OUTPUT_TOKENS = int(_env("SUMMARY_MAX_OUTPUT_TOKENS", default="2400"))
+SUMMARY_CONTINUE_MAX_OUTPUT_TOKENS = int(_env("SUMMARY_CONTINUE_MAX_OUTPUT_TOKENS", default="800"))
+SUMMARY_CHUNK_CHARS = int(_env("SUMMARY_CHUNK_CHARS", default="12000"))
+# Token budget per summary section. When set (> 0) it takes precedence over SUMMARY_CHUNK_CHARS,
+# which is then only used if counting fails. It defaults to 0 when SUMMARY_CHUNK_CHARS is configured,
+# so an explicit character budget keeps working.
+SUMMARY_CHUNK_TOKENS = int(
+    _env("SUMMARY_CHUNK_TOKENS", default="0" if _env("SUMMARY_CHUNK_CHARS", default="") else "3000")
+)
+SUMMARY_WORKERS = int(_env("SUMMARY_WORKERS", default="4"))
+TITLE_MODEL = _env("TITLE_MODEL", default=SUMMARY_MODEL)
+TITLE_FALLBACK_MODEL = _env("TITLE_FALLBACK_MODEL", default=SUMMARY_MODEL)
+TITLE_TEMPERATURE = float(_env("TITLE_TEMPERATURE", default="0.4"))
+TITLE_MAX_OUTPUT_TOKENS = int(_env("TITLE_MAX_OUTPUT_TOKENS", default="24"))
+GENERATION_CACHE_SIZE = int(_env("GENERATION_CACHE_SIZE", default="512"))
 
 if SUMMARY_API_KEY:
     genai.configure(api_key=SUMMARY_API_KEY)
 
 recording_event = threading.Event()
-audio_lock = threading.Lock()
-audio_chunks: list[np.ndarray] = []
+# Pre-allocated capture buffer; the callback only copies into it and advances the write index.
+audio_ring = np.empty(0, dtype=np.int16)
+audio_write_idx = 0
+# (current buffer, larger copy, frames already copied), prepared off the realtime thread for the callback to swap in.
+pending_ring: Optional[tuple[np.ndarray, np.ndarray, int]] = None
+# Integer factor between the device rate and RATE when the device cannot capture at RATE itself.
+capture_factor = 1
+# Per-block scratch for downsampling, so the realtime callback never allocates.
+capture_scratch = np.empty(0, dtype=np.int32)
+# Fixed interpolation plan (source indices, weights and float scratch) for devices at a non-integer multiple of RATE.
+capture_interp: Optional[tuple[np.ndarray, ...]] = None
 audio_stream: Optional[sd.InputStream] = None
+stream_session: Optional["StreamingSession"] = None
+job_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, JOB_WORKERS))
+jobs: Dict[str, concurrent.futures.Future] = {}
+# Completion time per finished job, for the sweep in submit_job.
+job_finished_at: Dict[str, float] = {}
+jobs_lock = threading.Lock()
+# Separate from job_executor so jobs waiting on their chunks or sections cannot starve the pool.
+recognize_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, RECOGNIZE_WORKERS))
+summary_executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, SUMMARY_WORKERS))
+
+
+# Status messages are printed by a logger thread so the audio callback never blocks on stdout.
+audio_status_queue: "queue.Queue[str]" = queue.Queue(maxsize=64)
+
+
+def _log_audio_status() -> None:
+    while True:
+        print(f"Audio status: {audio_status_queue.get()}", flush=True)
 
 
 def audio_callback(indata, frames, time_info, status):
+    global audio_write_idx
     if status:
-        print(f"Audio status: {status}", flush=True)
+        try:
+            audio_status_queue.put_nowait(str(status))
+        except queue.Full:
+            pass
     if recording_event.is_set():
-        with audio_lock:
-            audio_chunks.append(indata.copy())
+        block = indata[:, 0]
+        if capture_interp is not None:
+            block = _interpolate_block(block, *capture_interp)
+        elif capture_factor > 1:
+            groups = block[: frames // capture_factor * capture_factor].reshape(-1, capture_factor)
+            block = capture_scratch[: groups.shape[0]]
+            np.sum(groups, axis=1, dtype=np.int32, out=block)
+            block //= capture_factor
+        start = audio_write_idx
+        pending = pending_ring
+        if pending is not None:
+            _swap_in_ring(pending, start)
+        end = min(start + block.shape[0], audio_ring.shape[0])
+        audio_ring[start:end] = block[: end - start]
+        audio_write_idx = end
+
+
+def _recording_capacity(frames: int) -> int:
+    if RECORDING_MAX_SECONDS > 0:
+        return min(frames, RATE * RECORDING_MAX_SECONDS)
+    return frames
+
+
+def _prepare_ring_growth() -> None:
+    # Allocate and fill the larger buffer here so the callback only copies the last few blocks.
+    global pending_ring
+    ring = audio_ring
+    written = audio_write_idx
+    if pending_ring is not None or written < ring.shape[0] * RECORDING_GROW_AT:
+        return
+    capacity = _recording_capacity(ring.shape[0] * 2)
+    if capacity <= ring.shape[0]:
+        return
+    grown = np.empty(capacity, dtype=np.int16)
+    grown[:written] = ring[:written]
+    pending_ring = (ring, grown, written)
+
+
+def _swap_in_ring(pending: tuple[np.ndarray, np.ndarray, int], write_idx: int) -> None:
+    # Called from the audio callback: copy what arrived since the buffer was prepared, then switch over.
+    global audio_ring, pending_ring
+    source, grown, copied = pending
+    pending_ring = None
+    if source is not audio_ring or write_idx < copied:
+        # A new recording started since the copy was made.
+        return
+    grown[copied:write_idx] = source[copied:write_idx]
+    audio_ring = grown
+    session = stream_session
+    if session is not None:
+        session.use_ring(grown)
+
+
+def _watch_audio_ring() -> None:
+    while True:
+        time.sleep(1)
+        if recording_event.is_set():
+            _prepare_ring_growth()
+
+
+def _downsample(samples: np.ndarray, factor: int) -> np.ndarray:
+    # Averaging each group of samples low-passes and decimates in one step for integer rate ratios.
+    usable = samples.shape[0] // factor * factor
+    return samples[:usable].reshape(-1, factor).mean(axis=1).astype(np.int16)
+
+
+def _interpolation_plan(device_rate: int, block_frames: int) -> tuple[int, tuple[np.ndarray, ...]]:
+    # Smallest block with an exact device_rate:RATE ratio, repeated to roughly block_frames outputs,
+    # so every callback maps to the same source positions and the plan can be built once.
+    step = math.gcd(device_rate, RATE)
+    out_unit, in_unit = RATE // step, device_rate // step
+    repeats = max(1, round(block_frames / out_unit))
+    in_frames, out_frames = in_unit * repeats, out_unit * repeats
+    positions = np.arange(out_frames) * (in_frames / out_frames)
+    lower = positions.astype(np.intp)
+    upper = np.minimum(lower + 1, in_frames - 1)
+    weight = (positions - lower).astype(np.float32)
+    scratch = (
+        np.empty(in_frames, dtype=np.float32),
+        np.empty(out_frames, dtype=np.float32),
+        np.empty(out_frames, dtype=np.float32),
+    )
+    return in_frames, (lower, upper, weight) + scratch
+
+
+def _interpolate_block(
+    block: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    weight: np.ndarray,
+    source: np.ndarray,
+    low: np.ndarray,
+    high: np.ndarray,
+) -> np.ndarray:
+    # Linear interpolation onto the RATE grid, written entirely into preallocated buffers.
+    np.copyto(source, block)
+    np.take(source, lower, out=low)
+    np.take(source, upper, out=high)
+    np.subtract(high, low, out=high)
+    np.multiply(high, weight, out=high)
+    np.add(low, high, out=low)
+    return low
+
+
+def _resample(samples: np.ndarray, source_rate: int) -> np.ndarray:
+    # Bring uploaded audio to RATE: boxcar decimation for integer ratios, interpolation otherwise.
+    if source_rate == RATE or samples.size == 0:
+        return samples
+    if source_rate > RATE and source_rate % RATE == 0:
+        return _downsample(samples, source_rate // RATE)
+
+    source = samples.astype(np.float32)
+    width = -(-source_rate // RATE)
+    if width > 1:
+        # Moving average over the decimation span as a cheap anti-alias filter.
+        smoothed = np.convolve(source, np.full(width, 1.0 / width, dtype=np.float32), mode="full")
+        source = smoothed[width // 2 : width // 2 + source.size]
+    positions = np.arange(samples.shape[0] * RATE // source_rate) * (source_rate / RATE)
+    return np.rint(np.interp(positions, np.arange(source.size), source)).astype(np.int16)
+
+
+def _capture_settings() -> tuple[int, Any]:
+    # Prefer capturing at RATE so the host API resamples before audio reaches Python.
+    try:
+        sd.check_input_settings(samplerate=RATE, channels=1, dtype="int16")
+        return RATE, None
+    except Exception:
+        pass
+
+    # WASAPI shared mode only accepts the mixer rate unless asked to convert.
+    if hasattr(sd, "WasapiSettings"):
+        try:
+            wasapi = sd.WasapiSettings(auto_convert=True)
+            sd.check_input_settings(samplerate=RATE, channels=1, dtype="int16", extra_settings=wasapi)
+            return RATE, wasapi
+        except Exception:
+            pass
+
+    return int(sd.query_devices(kind="input")["default_samplerate"]), None
 
 
 def ensure_stream() -> None:
     # Ensure a single active input stream for recording.
-    global audio_stream
+    global audio_stream, audio_ring, capture_factor, capture_scratch, capture_interp
+    if audio_ring.shape[0] == 0:
+        audio_ring = np.empty(_recording_capacity(RATE * max(1, RECORDING_BUFFER_SECONDS)), dtype=np.int16)
     if audio_stream is None:
+        device_rate, extra_settings = _capture_settings()
+        block_frames = max(1, RATE * CAPTURE_BLOCK_MS // 1000)
+        if device_rate % RATE == 0:
+            capture_factor = device_rate // RATE
+            # Whole blocks at RATE also keep every callback divisible by the downsampling factor.
+            blocksize = capture_factor * block_frames
+            if capture_factor > 1:
+                print(f"Capturing at {device_rate} Hz and downsampling to {RATE} Hz.", flush=True)
+                capture_scratch = np.empty(block_frames, dtype=np.int32)
+        else:
+            capture_factor = 1
+            blocksize, capture_interp = _interpolation_plan(device_rate, block_frames)
+            print(f"Capturing at {device_rate} Hz and resampling to {RATE} Hz.", flush=True)
         audio_stream = sd.InputStream(
-            samplerate=RATE,
+            samplerate=device_rate,
+            blocksize=blocksize,
             channels=1,
             dtype="int16",
             callback=audio_callback,
+            extra_settings=extra_settings,
         )
         audio_stream.start()
+        threading.Thread(target=_log_audio_status, daemon=True).start()
+        threading.Thread(target=_watch_audio_ring, daemon=True).start()
+
+
+CORS_HEADERS = [
+    ("Access-Control-Allow-Origin", "*"),
+    ("Access-Control-Allow-Methods", "GET, POST, OPTIONS"),
+    ("Access-Control-Allow-Headers", "Content-Type, Authorization, Prefer"),
+]
+CORS_HEADER_BYTES = "".join(f"{name}: {value}\r\n" for name, value in CORS_HEADERS).encode("latin-1")
 
 
 def send_cors_headers(handler: BaseHTTPRequestHandler) -> None:
     # Allow browser-based frontend requests.
-    handler.send_header("Access-Control-Allow-Origin", "*")                 #request HTTP endpoint
-    handler.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-    handler.send_header("Access-Control-Allow-Headers", "Content-Type, Authorization")
+    for name, value in CORS_HEADERS:
+        handler.send_header(name, value)
+
+
+def _json_dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_loads(raw: bytes) -> Any:
+    # Both parsers take the raw body bytes directly; no separate decode pass.
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _frame_response(protocol_version: str, status: int, body: bytes) -> bytes:
+    reason = BaseHTTPRequestHandler.responses[status][0] if status in BaseHTTPRequestHandler.responses else ""
+    head = b"%s %d %s\r\nContent-Type: application/json\r\n%sContent-Length: %d\r\n\r\n" % (
+        protocol_version.encode("latin-1"),
+        status,
+        reason.encode("latin-1"),
+        CORS_HEADER_BYTES,
+        len(body),
+    )
+    return head + body
 
 
 def build_response(handler: BaseHTTPRequestHandler, status: int, payload: Dict[str, Any]) -> None:
-    body = json.dumps(payload).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json")
-    send_cors_headers(handler)
-    handler.send_header("Content-Length", str(len(body)))
-    handler.end_headers()
-    handler.wfile.write(body)
+    # Status line, headers and body go out in a single write instead of one per header plus the body.
+    handler.wfile.write(_frame_response(handler.protocol_version, status, _json_dumps(payload)))
+
+
+# Responses that never change are framed once at import and written as-is.
+HTTP_PROTOCOL = BaseHTTPRequestHandler.protocol_version
+HEALTH_RESPONSES = {
+    recording: _frame_response(HTTP_PROTOCOL, 200, _json_dumps({"ok": True, "recording": recording}))
+    for recording in (False, True)
+}
+RECORDING_RESPONSE = _frame_response(HTTP_PROTOCOL, 200, _json_dumps({"status": "recording"}))
+NOT_FOUND_RESPONSE = _frame_response(HTTP_PROTOCOL, 404, _json_dumps({"error": "Not found"}))
+PREFLIGHT_RESPONSE = b"%s 204 No Content\r\n%s\r\n" % (HTTP_PROTOCOL.encode("latin-1"), CORS_HEADER_BYTES)
+
+
+# Keep the HTTP/2 connection alive between recordings so idle gaps do not cost a new handshake.
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.keepalive_permit_without_calls", 1),
+]
 
 
-speech_client = SpeechClient()
+def _create_speech_client() -> SpeechClient:
+    channel = SpeechGrpcTransport.create_channel(f"{SPEECH_ENDPOINT}:443", options=GRPC_CHANNEL_OPTIONS)
+    return SpeechClient(transport=SpeechGrpcTransport(host=SPEECH_ENDPOINT, channel=channel))
 
 
-def _recognize_chunk(samples: np.ndarray) -> Dict[str, Any]:
-    if samples.size == 0:
-        return {"text": "", "language": None}
+speech_client = _create_speech_client()
+
+
+def warm_speech_client() -> None:
+    # Any RPC opens the gRPC channel; doing it at startup keeps the TLS handshake off the first recording.
+    try:
+        speech_client.get_recognizer(name=RECOGNIZER)
+    except Exception:
+        pass
+
+
+UPLOAD_FLAC = sf is not None and TRANSCRIPTION_UPLOAD_FLAC
 
-    byte_io = io.BytesIO()
-    wav.write(byte_io, RATE, samples)
-    audio_bytes = byte_io.getvalue()
+# Raw PCM has no container, so its decoding must be explicit.
+LINEAR16_DECODING = cloud_speech.ExplicitDecodingConfig(
+    encoding=cloud_speech.ExplicitDecodingConfig.AudioEncoding.LINEAR16,
+    sample_rate_hertz=RATE,
+    audio_channel_count=1,
+)
 
-    config = cloud_speech.RecognitionConfig(
+# Recognition configs are the same for every request, so they are built once.
+if UPLOAD_FLAC:
+    # FLAC's header carries rate and channels, so auto-detection can read it.
+    BATCH_CONFIG = cloud_speech.RecognitionConfig(
         auto_decoding_config=cloud_speech.AutoDetectDecodingConfig(),
         language_codes=LANGUAGES,
         model=MODEL,
         features=cloud_speech.RecognitionFeatures(enable_automatic_punctuation=True),
     )
+else:
+    BATCH_CONFIG = cloud_speech.RecognitionConfig(
+        explicit_decoding_config=LINEAR16_DECODING,
+        language_codes=LANGUAGES,
+        model=MODEL,
+        features=cloud_speech.RecognitionFeatures(enable_automatic_punctuation=True),
+    )
+
+STREAMING_CONFIG = cloud_speech.StreamingRecognitionConfig(
+    config=cloud_speech.RecognitionConfig(
+        explicit_decoding_config=LINEAR16_DECODING,
+        language_codes=LANGUAGES,
+        model=STREAMING_MODEL,
+        features=cloud_speech.RecognitionFeatures(enable_automatic_punctuation=True),
+    ),
+    streaming_features=cloud_speech.StreamingRecognitionFeatures(
+        interim_results=STREAMING_INTERIM_RESULTS,
+    ),
+)
+
+
+ENERGY_FRAME = max(1, RATE // 50)
+
+
+def _frame_energy(samples: np.ndarray) -> np.ndarray:
+    # Mean absolute amplitude per 20 ms frame in one vectorised pass (int32 so -32768 cannot overflow).
+    usable = samples.shape[0] // ENERGY_FRAME * ENERGY_FRAME
+    return np.abs(samples[:usable], dtype=np.int32).reshape(-1, ENERGY_FRAME).mean(axis=1)
+
+
+def _voiced_frames(energy: np.ndarray) -> np.ndarray:
+    # Frames at or above the threshold, widened by the padding so word edges and short pauses survive.
+    voiced = energy >= SILENCE_THRESHOLD
+    radius = int(RATE * max(0.0, SILENCE_PADDING_SECONDS)) // ENERGY_FRAME
+    if radius == 0 or not voiced.any():
+        return voiced
+    # "full" output sliced back to len(voiced); "same" returns the kernel length for short clips.
+    widened = np.convolve(voiced, np.ones(2 * radius + 1, dtype=np.int32), mode="full")
+    return widened[radius : radius + voiced.size] > 0
+
+
+def _recognize_chunk(samples: np.ndarray) -> Dict[str, Any]:
+    if samples.size == 0:
+        return {"text": "", "language": None}
+
+    if UPLOAD_FLAC:
+        # Lossless FLAC shrinks speech uploads.
+        byte_io = io.BytesIO()
+        sf.write(byte_io, samples, RATE, format="FLAC", subtype="PCM_16")
+        audio_bytes = byte_io.getvalue()
+    else:
+        # Samples are already mono LINEAR16 at RATE, so send the PCM without a WAV container.
+        audio_bytes = np.ascontiguousarray(samples).tobytes()
 
     request = cloud_speech.RecognizeRequest(
-        recognizer=f"projects/{PROJECT_ID}/locations/global/recognizers/_",
-        config=config,
+        recognizer=RECOGNIZER,
+        config=BATCH_CONFIG,
         content=audio_bytes,
     )
 
@@ -139,21 +520,54 @@ def _recognize_chunk(samples: np.ndarray) -> Dict[str, Any]:
     return {"text": " ".join(transcript_parts).strip(), "language": language}
 
 
+def _split_at_silence(energy: np.ndarray, total: int, chunk_size: int) -> list[tuple[int, int]]:
+    # Cut before each chunk_size boundary at the quietest frame of the search window.
+    search_frames = max(1, int(RATE * TRANSCRIPTION_SPLIT_SEARCH_SECONDS) // ENERGY_FRAME)
+    bounds = []
+    start = 0
+    while total - start > chunk_size:
+        boundary_frame = (start + chunk_size) // ENERGY_FRAME
+        window_start = max(start // ENERGY_FRAME + 1, boundary_frame - search_frames)
+        cut = start + chunk_size
+        if boundary_frame > window_start:
+            cut = (window_start + int(np.argmin(energy[window_start:boundary_frame]))) * ENERGY_FRAME
+        bounds.append((start, cut))
+        start = cut
+    bounds.append((start, total))
+    return bounds
+
+
 def transcribe_audio(samples: np.ndarray) -> Dict[str, Any]:
     # Chunk long recordings to avoid oversized STT requests.
     if samples.size == 0:
         return {"text": "", "language": None}
 
+    # One energy pass drives both the silence removal and the cut points.
+    energy = _frame_energy(samples)
+    voiced = _voiced_frames(energy)
+    if not voiced.any():
+        return {"text": "", "language": None}
+
+    # Long silences are dropped, so only voiced audio is uploaded and billed.
+    if not voiced.all():
+        samples = samples[: energy.shape[0] * ENERGY_FRAME].reshape(-1, ENERGY_FRAME)[voiced].ravel()
+        energy = energy[voiced]
+
     chunk_seconds = max(1, TRANSCRIPTION_CHUNK_SECONDS)
     chunk_size = int(RATE * chunk_seconds)
     if samples.shape[0] <= chunk_size:
-        return _recognize_chunk(samples)
+        bounds = [(0, samples.shape[0])]
+    else:
+        bounds = _split_at_silence(energy, samples.shape[0], chunk_size)
 
+    chunks = [samples[start:end] for start, end in bounds]
+    if len(chunks) <= 1:
+        return _recognize_chunk(chunks[0]) if chunks else {"text": "", "language": None}
+
+    # Chunks are recognized concurrently; map() keeps them in recording order.
     transcript_parts = []
     language = None
-    for start in range(0, samples.shape[0], chunk_size):
-        chunk = samples[start : start + chunk_size]
-        result = _recognize_chunk(chunk)
+    for result in recognize_executor.map(_recognize_chunk, chunks):
         if result.get("text"):
             transcript_parts.append(result["text"])
         if language is None and result.get("language"):
@@ -162,28 +576,174 @@ def transcribe_audio(samples: np.ndarray) -> Dict[str, Any]:
     return {"text": " ".join(transcript_parts).strip(), "language": language}
 
 
+class StreamingSession:
+    # Feeds captured microphone audio to StreamingRecognize while recording is active.
+    def __init__(self) -> None:
+        self.final_parts: list[str] = []
+        self.interim_text = ""
+        self.language: Optional[str] = None
+        self.error: Optional[Exception] = None
+        # One queue per /record/events client so every listener sees every event.
+        self._subscribers: list["queue.Queue[Optional[Dict[str, Any]]]"] = []
+        self._subscribers_lock = threading.Lock()
+        # Bound to the buffer of this recording so it can be handed off while the stream drains.
+        self._ring = audio_ring
+        self._read_idx = 0
+        self._end_idx: Optional[int] = None
+        self._ended = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def use_ring(self, ring: np.ndarray) -> None:
+        # Follow the capture buffer when it is swapped for a larger copy mid-recording.
+        self._ring = ring
+
+    def stop(self) -> None:
+        # Signal end-of-stream; the remaining captured frames are still sent.
+        if self._end_idx is None:
+            self._end_idx = audio_write_idx
+
+    def finish(self) -> Dict[str, Any]:
+        # Wait for the final results of a stopped session to arrive.
+        self.stop()
+        self._thread.join(STREAMING_STOP_TIMEOUT)
+        if self._thread.is_alive():
+            print("Streaming session did not finish in time.", flush=True)
+        return {"text": " ".join(self.final_parts).strip(), "language": self.language}
+
+    @property
+    def active(self) -> bool:
+        return self._thread.is_alive()
+
+    def subscribe(self) -> "queue.Queue[Optional[Dict[str, Any]]]":
+        events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        with self._subscribers_lock:
+            self._subscribers.append(events)
+        return events
+
+    def unsubscribe(self, events: "queue.Queue[Optional[Dict[str, Any]]]") -> None:
+        with self._subscribers_lock:
+            if events in self._subscribers:
+                self._subscribers.remove(events)
+
+    def _publish(self, event: Optional[Dict[str, Any]]) -> None:
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for events in subscribers:
+            events.put(event)
+
+    @property
+    def complete(self) -> bool:
+        # True only when every stream ended cleanly, so the final parts cover the whole recording.
+        return self.error is None and not self._thread.is_alive()
+
+    def _requests(self):
+        yield cloud_speech.StreamingRecognizeRequest(
+            recognizer=RECOGNIZER,
+            streaming_config=STREAMING_CONFIG,
+        )
+        stream_frames = 0
+        max_frames = RATE * max(1, STREAMING_RESTART_SECONDS)
+        while stream_frames < max_frames:
+            end_idx = self._end_idx
+            limit = audio_write_idx if end_idx is None else end_idx
+            end = min(limit, self._read_idx + STREAMING_CHUNK_FRAMES)
+            if end <= self._read_idx:
+                if end_idx is not None:
+                    self._ended = True
+                    return
+                time.sleep(STREAMING_POLL_SECONDS)
+                continue
+            chunk = self._ring[self._read_idx : end]
+            stream_frames += end - self._read_idx
+            self._read_idx = end
+            yield cloud_speech.StreamingRecognizeRequest(audio=chunk.tobytes())
+
+    def _handle_response(self, response) -> None:
+        interim_parts = []
+        for result in response.results:
+            if not result.alternatives:
+                continue
+            text = result.alternatives[0].transcript.strip()
+            if not result.is_final:
+                interim_parts.append(text)
+                continue
+            if text:
+                self.final_parts.append(text)
+                self._publish({"type": "final", "text": text, "language": result.language_code or None})
+            if self.language is None and result.language_code:
+                self.language = result.language_code
+
+        self.interim_text = " ".join(part for part in interim_parts if part)
+        if self.interim_text:
+            self._publish({"type": "interim", "text": self.interim_text})
+
+    def _run(self) -> None:
+        try:
+            # Each pass is one stream; the request generator ends it at the restart limit.
+            while not self._ended:
+                responses = speech_client.streaming_recognize(requests=self._requests())
+                for response in responses:
+                    self._handle_response(response)
+        except Exception as exc:
+            self.error = exc
+            print(f"Streaming transcription failed: {exc}", flush=True)
+        finally:
+            self._publish(None)
+
+
+def start_streaming_session() -> None:
+    global stream_session, audio_write_idx, pending_ring
+    audio_write_idx = 0
+    pending_ring = None
+    stream_session = StreamingSession()
+    stream_session.start()
+    recording_event.set()
+
+
+def stop_streaming_session() -> Optional[StreamingSession]:
+    global stream_session
+    recording_event.clear()
+    session, stream_session = stream_session, None
+    if session is not None:
+        session.stop()
+    return session
+
+
+def recorded_samples() -> np.ndarray:
+    # View of the audio captured since the last start; no copy is made.
+    if audio_write_idx >= audio_ring.shape[0] > 0:
+        print(f"Capture buffer filled up after {audio_write_idx // RATE}s; later audio was dropped.", flush=True)
+    return audio_ring[:audio_write_idx]
+
+
+def release_audio_ring() -> None:
+    # Leave the current buffer to whoever still holds a view; the next recording allocates a new one.
+    global audio_ring, pending_ring
+    audio_ring = np.empty(0, dtype=np.int16)
+    pending_ring = None
+
+
 def _extract_text(response) -> tuple[str, Optional[int]]:
     # Extract text from genai response without relying on response.text.
-    summary_text = ""
     finish_reason = None
-
-    candidates = getattr(response, "candidates", None) or []
-    for candidate in candidates:
+    for candidate in getattr(response, "candidates", None) or ():
         finish_reason = getattr(candidate, "finish_reason", None)
-        content = getattr(candidate, "content", None)
-        parts = getattr(content, "parts", None) if content else None
+        parts = getattr(getattr(candidate, "content", None), "parts", None)
         if not parts:
             continue
-        text_parts = []
-        for part in parts:
-            text_value = getattr(part, "text", None)
-            if text_value:
-                text_parts.append(text_value)
-        if text_parts:
-            summary_text = " ".join(text_parts).strip()
-            break
+        # Stop at the first candidate with text; later candidates are never used.
+        text = " ".join(part.text for part in parts if getattr(part, "text", None))
+        if text:
+            return text.strip(), finish_reason
 
-    return summary_text, finish_reason
+    return "", finish_reason
+
+
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+SENTENCE_END_RE = re.compile(r"[.!?]$")
 
 
 def _needs_continuation(text: str, finish_reason: Optional[int]) -> bool:
@@ -192,7 +752,7 @@ def _needs_continuation(text: str, finish_reason: Optional[int]) -> bool:
     if finish_reason == 2:
         return True
     trimmed = text.rstrip().rstrip("\"'")
-    return re.search(r"[.!?]$", trimmed) is None
+    return SENTENCE_END_RE.search(trimmed) is None
 
 
 def _fallback_summary_text(transcript: str, max_chars: int = 1200) -> str:
@@ -207,41 +767,61 @@ def _fallback_summary_text(transcript: str, max_chars: int = 1200) -> str:
     return snippet.rstrip() + "..."
 
 
+def _last_sentence_end(text: str, start: int, limit: int) -> int:
+    # Index just past the last ".", "!" or "?" in text[start:limit] that is followed by whitespace, or -1.
+    end = limit
+    while True:
+        idx = max(text.rfind(".", start, end), text.rfind("!", start, end), text.rfind("?", start, end))
+        if idx < 0 or text[idx + 1].isspace():
+            return idx + 1 if idx >= 0 else -1
+        end = idx
+
+
 def _split_transcript(text: str, max_chars: int) -> list[str]:
+    # Cut at the last sentence end that fits, slicing the original string instead of building a sentence list.
     if len(text) <= max_chars:
         return [text]
 
-    sentences = re.split(r"(?<=[.!?])\s+", text)
     chunks = []
-    current = []
-    current_len = 0
+    start = 0
+    while len(text) - start > max_chars:
+        cut = _last_sentence_end(text, start, start + max_chars)
+        if cut <= start:
+            # A single sentence longer than max_chars is split hard.
+            cut = start + max_chars
+        chunk = text[start:cut].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = cut
+        while start < len(text) and text[start].isspace():
+            start += 1
 
-    for sentence in sentences:
-        if not sentence:
-            continue
-        sentence_len = len(sentence)
-
-        if sentence_len > max_chars:
-            if current:
-                chunks.append(" ".join(current).strip())
-                current = []
-                current_len = 0
-            for i in range(0, sentence_len, max_chars):
-                chunks.append(sentence[i : i + max_chars].strip())
-            continue
+    tail = text[start:].strip()
+    if tail:
+        chunks.append(tail)
+    return chunks
 
-        if current_len + sentence_len + 1 > max_chars and current:
-            chunks.append(" ".join(current).strip())
-            current = [sentence]
-            current_len = sentence_len
-        else:
-            current.append(sentence)
-            current_len += sentence_len + 1
 
-    if current:
-        chunks.append(" ".join(current).strip())
+# Generated text keyed by prompt hash and generation settings, so repeated
+# /summarize and /title calls (and unchanged chunks of a resubmitted transcript) skip Gemini.
+generation_cache: "collections.OrderedDict[tuple, tuple[str, Optional[int]]]" = collections.OrderedDict()
+generation_cache_lock = threading.Lock()
+
+
+# GenerativeModel objects are reused per model name instead of rebuilt per call.
+model_cache: Dict[str, genai.GenerativeModel] = {}
+
 
-    return [chunk for chunk in chunks if chunk]
+def _get_model(model_name: str) -> genai.GenerativeModel:
+    model = model_cache.get(model_name)
+    if model is None:
+        model = model_cache.setdefault(model_name, genai.GenerativeModel(model_name))
+    return model
+
+
+def _generation_key(prompt: str, model_name: str, temperature: float, max_output_tokens: int) -> tuple:
+    digest = hashlib.blake2b(prompt.strip().encode("utf-8"), digest_size=16).hexdigest()
+    return digest, model_name, temperature, max_output_tokens
 
 
 def _generate_text_with_model(
@@ -250,7 +830,14 @@ def _generate_text_with_model(
     temperature: float,
     max_output_tokens: int,
 ) -> tuple[str, Optional[int]]:
-    model = genai.GenerativeModel(model_name)
+    key = _generation_key(prompt, model_name, temperature, max_output_tokens)
+    with generation_cache_lock:
+        cached = generation_cache.get(key)
+        if cached is not None:
+            generation_cache.move_to_end(key)
+            return cached
+
+    model = _get_model(model_name)
     response = model.generate_content(
         prompt,
         generation_config={
@@ -258,7 +845,80 @@ def _generate_text_with_model(
             "max_output_tokens": max_output_tokens,
         },
     )
-    return _extract_text(response)
+    result = _extract_text(response)
+
+    # Empty answers are left uncached so the fallback model and later retries still get a chance.
+    if result[0] and GENERATION_CACHE_SIZE > 0:
+        with generation_cache_lock:
+            generation_cache[key] = result
+            generation_cache.move_to_end(key)
+            while len(generation_cache) > GENERATION_CACHE_SIZE:
+                generation_cache.popitem(last=False)
+    return result
+
+
+# Token counts per transcript digest, so a repeated /summarize skips count_tokens like it skips generation.
+token_count_cache: "collections.OrderedDict[tuple[str, str], int]" = collections.OrderedDict()
+
+
+def _count_tokens(text: str) -> int:
+    key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest(), SUMMARY_MODEL)
+    with generation_cache_lock:
+        cached = token_count_cache.get(key)
+        if cached is not None:
+            token_count_cache.move_to_end(key)
+            return cached
+
+    total_tokens = _get_model(SUMMARY_MODEL).count_tokens(text).total_tokens
+    if GENERATION_CACHE_SIZE > 0:
+        with generation_cache_lock:
+            token_count_cache[key] = total_tokens
+            while len(token_count_cache) > GENERATION_CACHE_SIZE:
+                token_count_cache.popitem(last=False)
+    return total_tokens
+
+
+def _summary_chunk_chars(text: str) -> int:
+    # Turn the token budget into characters using this transcript's own density (one count_tokens call).
+    if SUMMARY_CHUNK_TOKENS > 0:
+        if len(text) <= SUMMARY_CHUNK_TOKENS:
+            # A token covers at least one character, so the whole transcript fits.
+            return len(text)
+        try:
+            total_tokens = _count_tokens(text)
+        except Exception as exc:
+            print(f"Token count failed ({exc}); chunking by SUMMARY_CHUNK_CHARS.", flush=True)
+        else:
+            if total_tokens > 0:
+                return max(1000, len(text) * SUMMARY_CHUNK_TOKENS // total_tokens)
+    return max(1000, SUMMARY_CHUNK_CHARS)
+
+
+def _summarize_chunk(idx: int, chunk: str) -> str:
+    chunk_prompt = (
+        "Write a detailed FeedPulse-style paragraph (5-7 sentences) that captures this section clearly. "
+        "Aim for roughly 80-120 words. Use natural narrative sentences like the examples: context, "
+        "discussion points, decisions, responsibilities, challenges, and any numbers or dates. "
+        "Preserve specific tools, components, or features mentioned. Do not add labels, headings, "
+        "bullets, or commentary. End with a complete final sentence.\\n\\n"
+        f"Section {idx}:\\n{chunk}"
+    )
+    chunk_text, _ = _generate_text_with_model(
+        chunk_prompt,
+        SUMMARY_MODEL,
+        SUMMARY_TEMPERATURE,
+        SUMMARY_MAX_OUTPUT_TOKENS,
+    )
+    if not chunk_text and SUMMARY_FALLBACK_MODEL and SUMMARY_FALLBACK_MODEL != SUMMARY_MODEL:
+        chunk_text, _ = _generate_text_with_model(
+            chunk_prompt,
+            SUMMARY_FALLBACK_MODEL,
+            SUMMARY_TEMPERATURE,
+            SUMMARY_MAX_OUTPUT_TOKENS,
+        )
+    if not chunk_text:
+        chunk_text = _fallback_summary_text(chunk, max_chars=400)
+    return chunk_text
 
 
 def summarize_transcript(transcript: str) -> str:
@@ -270,37 +930,12 @@ def summarize_transcript(transcript: str) -> str:
     if not text:
         return ""
 
-    chunks = _split_transcript(text, max(1000, SUMMARY_CHUNK_CHARS))
-    chunk_summaries = []
+    chunks = _split_transcript(text, _summary_chunk_chars(text))
     finish_reason = None
 
     if len(chunks) > 1:
-        for idx, chunk in enumerate(chunks, start=1):
-            chunk_prompt = (
-                "Write a detailed FeedPulse-style paragraph (5-7 sentences) that captures this section clearly. "
-                "Aim for roughly 80-120 words. Use natural narrative sentences like the examples: context, "
-                "discussion points, decisions, responsibilities, challenges, and any numbers or dates. "
-                "Preserve specific tools, components, or features mentioned. Do not add labels, headings, "
-                "bullets, or commentary. End with a complete final sentence.\\n\\n"
-                f"Section {idx}:\\n{chunk}"
-            )
-            chunk_text, finish_reason = _generate_text_with_model(
-                chunk_prompt,
-                SUMMARY_MODEL,
-                SUMMARY_TEMPERATURE,
-                SUMMARY_MAX_OUTPUT_TOKENS,
-            )
-            if not chunk_text and SUMMARY_FALLBACK_MODEL and SUMMARY_FALLBACK_MODEL != SUMMARY_MODEL:
-                chunk_text, finish_reason = _generate_text_with_model(
-                    chunk_prompt,
-                    SUMMARY_FALLBACK_MODEL,
-                    SUMMARY_TEMPERATURE,
-                    SUMMARY_MAX_OUTPUT_TOKENS,
-                )
-            if not chunk_text:
-                chunk_text = _fallback_summary_text(chunk, max_chars=400)
-            chunk_summaries.append(chunk_text)
-
+        # Sections are independent, so their Gemini calls overlap instead of adding up.
+        chunk_summaries = list(summary_executor.map(_summarize_chunk, range(1, len(chunks) + 1), chunks))
         combined = " ".join(chunk_summaries).strip()
         prompt = (
             "Write a FeedPulse reflection in 3-5 paragraphs, similar in tone and structure to the examples. "
@@ -377,7 +1012,7 @@ def _fallback_title_text(transcript: str, max_words: int = 12) -> str:
     if not transcript:
         return "New Recording"
 
-    first_sentence = re.split(r"(?<=[.!?])\s+", transcript.strip(), maxsplit=1)[0]
+    first_sentence = SENTENCE_SPLIT_RE.split(transcript.strip(), maxsplit=1)[0]
     words = first_sentence.split()
     if not words:
         return "New Recording"
@@ -456,9 +1091,9 @@ def _decode_audio_chunks(
             continue
         raise ValueError("Invalid chunk entry; expected base64 string or object.")
 
-    resolved_rate = int(sample_rate) if sample_rate else RATE
-    if resolved_rate != RATE:
-        raise ValueError(f"Sample rate mismatch. Expected {RATE}, got {resolved_rate}.")
+    resolved_rate = int(sample_rate) if sample_rate else AUDIO_SAMPLE_RATE
+    if resolved_rate <= 0:
+        raise ValueError(f"Invalid sample rate {resolved_rate}.")
 
     audio_bytes = b"".join(raw_parts)
     samples = np.frombuffer(audio_bytes, dtype=np.int16)
@@ -470,6 +1105,10 @@ def _decode_audio_chunks(
         samples = samples[: frame_count * channel_count].reshape(frame_count, channel_count)
         samples = samples.mean(axis=1).astype(np.int16)
 
+    if resolved_rate != RATE:
+        samples = _resample(samples, resolved_rate)
+        resolved_rate = RATE
+
     return samples, resolved_rate
 
 
@@ -484,19 +1123,93 @@ def list_summary_models() -> list[str]:
     return models
 
 
+def _add_title_and_duration(result: Dict[str, Any], sample_count: int, sample_rate: int) -> Dict[str, Any]:
+    try:
+        result["title"] = generate_title(result.get("text", ""))
+    except Exception as exc:
+        result["title"] = "New Recording"
+        print(f"Title generation failed: {exc}", flush=True)
+
+    result["duration_seconds"] = float(sample_count / sample_rate)
+    return result
+
+
+def complete_recording(session: StreamingSession, samples: np.ndarray) -> tuple[int, Dict[str, Any]]:
+    result = session.finish()
+    if not session.complete:
+        # A stream failed or timed out, so its transcript may be truncated; the full
+        # recording is still in the buffer for a batch pass.
+        print("Streaming transcript incomplete; transcribing the recording in batch.", flush=True)
+        try:
+            result = transcribe_audio(samples)
+        except Exception as exc:
+            return 500, {"error": str(exc)}
+
+    return 200, _add_title_and_duration(result, len(samples), RATE)
+
+
+def complete_upload(samples: np.ndarray, sample_rate: int) -> tuple[int, Dict[str, Any]]:
+    try:
+        result = transcribe_audio(samples)
+    except Exception as exc:
+        return 500, {"error": str(exc)}
+
+    return 200, _add_title_and_duration(result, len(samples), sample_rate)
+
+
+def complete_summary(transcript: str) -> tuple[int, Dict[str, Any]]:
+    try:
+        return 200, {"summary": summarize_transcript(transcript)}
+    except Exception as exc:
+        return 500, {"error": str(exc)}
+
+
+def complete_title(transcript: str) -> tuple[int, Dict[str, Any]]:
+    try:
+        return 200, {"title": generate_title(transcript)}
+    except Exception as exc:
+        return 500, {"error": str(exc)}
+
+
+def wants_async(handler: BaseHTTPRequestHandler) -> bool:
+    # Clients opt in to 202 + polling with "Prefer: respond-async"; everyone else gets the result inline.
+    return "respond-async" in handler.headers.get("Prefer", "")
+
+
+def _mark_job_finished(job_id: str) -> None:
+    with jobs_lock:
+        if job_id in jobs:
+            job_finished_at[job_id] = time.monotonic()
+
+
+def _sweep_jobs() -> None:
+    cutoff = time.monotonic() - JOB_RESULT_TTL_SECONDS
+    with jobs_lock:
+        for job_id in [job_id for job_id, finished in job_finished_at.items() if finished < cutoff]:
+            jobs.pop(job_id, None)
+            del job_finished_at[job_id]
+
+
+def submit_job(func, *args: Any) -> str:
+    job_id = uuid.uuid4().hex
+    _sweep_jobs()
+    future = job_executor.submit(func, *args)
+    with jobs_lock:
+        jobs[job_id] = future
+    future.add_done_callback(lambda _: _mark_job_finished(job_id))
+    return job_id
+
+
 class TranscriptionHandler(BaseHTTPRequestHandler):
+    # Socket timeout, so a client that stalls mid-request frees its pool worker instead of holding it.
+    timeout = HTTP_TIMEOUT if HTTP_TIMEOUT > 0 else None
+
     def do_OPTIONS(self) -> None:
-        self.send_response(204)
-        send_cors_headers(self)
-        self.end_headers()
+        self.wfile.write(PREFLIGHT_RESPONSE)
 
     def do_GET(self) -> None:
         if self.path == "/health":
-            build_response(
-                self,
-                200,
-                {"ok": True, "recording": recording_event.is_set()},
-            )
+            self.wfile.write(HEALTH_RESPONSES[recording_event.is_set()])
             return
         if self.path == "/summary/models":
             try:
@@ -506,51 +1219,99 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
                 return
             build_response(self, 200, {"models": models})
             return
-        build_response(self, 404, {"error": "Not found"})
+        if self.path == "/record/events":
+            self._stream_events()
+            return
+        if self.path.startswith("/jobs/"):
+            self._job_status(self.path[len("/jobs/") :])
+            return
+        self.wfile.write(NOT_FOUND_RESPONSE)
+
+    def _job_status(self, job_id: str) -> None:
+        future = jobs.get(job_id)
+        if future is None:
+            build_response(self, 404, {"error": "Unknown job"})
+            return
+        if not future.done():
+            build_response(self, 202, {"job_id": job_id, "status": "pending"})
+            return
+
+        # Finished jobs are handed out once and then forgotten.
+        with jobs_lock:
+            jobs.pop(job_id, None)
+            job_finished_at.pop(job_id, None)
+        try:
+            status, payload = future.result()
+        except Exception as exc:
+            status, payload = 500, {"error": str(exc)}
+        build_response(self, status, payload)
+
+    def _stream_events(self) -> None:
+        # Push interim and final transcripts of the active recording as server-sent events.
+        session = stream_session
+        if session is None:
+            build_response(self, 409, {"error": "Not recording"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        send_cors_headers(self)
+        self.end_headers()
+        events = session.subscribe()
+        try:
+            while True:
+                try:
+                    event = events.get(timeout=STREAMING_EVENT_POLL_SECONDS)
+                except queue.Empty:
+                    # The end-of-stream marker is missed if the session ended before we subscribed.
+                    if not session.active:
+                        break
+                    continue
+                if event is None:
+                    break
+                self.wfile.write(b"data: " + _json_dumps(event) + b"\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError, TimeoutError):
+            return
+        finally:
+            session.unsubscribe(events)
 
     def do_POST(self) -> None:
         if self.path == "/record/start":
             ensure_stream()
-            with audio_lock:
-                audio_chunks.clear()
-            recording_event.set()
-            build_response(self, 200, {"status": "recording"})
+            stop_streaming_session()
+            start_streaming_session()
+            self.wfile.write(RECORDING_RESPONSE)
             return
 
         if self.path == "/record/stop":
-            recording_event.clear()
-            with audio_lock:
-                chunks = list(audio_chunks)
-                audio_chunks.clear()
-
-            if not chunks:
+            session = stop_streaming_session()
+            if session is None:
                 build_response(self, 400, {"error": "No audio recorded"})
                 return
 
-            samples = np.concatenate(chunks, axis=0)
-            duration_seconds = float(len(samples) / RATE)
-
-            try:
-                result = transcribe_audio(samples)
-            except Exception as exc:
-                build_response(self, 500, {"error": str(exc)})
+            samples = recorded_samples()
+            if samples.size == 0:
+                build_response(self, 400, {"error": "No audio recorded"})
                 return
 
-            try:
-                result["title"] = generate_title(result.get("text", ""))
-            except Exception as exc:
-                result["title"] = "New Recording"
-                print(f"Title generation failed: {exc}", flush=True)
+            # The finished recording keeps this buffer, so a new /record/start cannot overwrite it.
+            release_audio_ring()
+            if wants_async(self):
+                job_id = submit_job(complete_recording, session, samples)
+                build_response(self, 202, {"job_id": job_id, "status": "pending"})
+                return
 
-            result["duration_seconds"] = duration_seconds
-            build_response(self, 200, result)
+            status, result = complete_recording(session, samples)
+            build_response(self, status, result)
             return
 
         if self.path == "/transcribe/chunks":
             length = int(self.headers.get("Content-Length", "0"))
             raw = self.rfile.read(length) if length else b"{}"
             try:
-                payload = json.loads(raw.decode("utf-8"))
+                payload = _json_loads(raw)
             except json.JSONDecodeError:
                 build_response(self, 400, {"error": "Invalid JSON payload"})
                 return
@@ -575,27 +1336,20 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
                 build_response(self, 400, {"error": "No audio samples decoded"})
                 return
 
-            try:
-                result = transcribe_audio(samples)
-            except Exception as exc:
-                build_response(self, 500, {"error": str(exc)})
+            if wants_async(self):
+                job_id = submit_job(complete_upload, samples, resolved_rate)
+                build_response(self, 202, {"job_id": job_id, "status": "pending"})
                 return
 
-            try:
-                result["title"] = generate_title(result.get("text", ""))
-            except Exception as exc:
-                result["title"] = "New Recording"
-                print(f"Title generation failed: {exc}", flush=True)
-
-            result["duration_seconds"] = float(len(samples) / resolved_rate)
-            build_response(self, 200, result)
+            status, result = complete_upload(samples, resolved_rate)
+            build_response(self, status, result)
             return
 
         if self.path == "/summarize":
             length = int(self.headers.get("Content-Length", "0"))
             raw = self.rfile.read(length) if length else b"{}"
             try:
-                payload = json.loads(raw.decode("utf-8"))
+                payload = _json_loads(raw)
             except json.JSONDecodeError:
                 build_response(self, 400, {"error": "Invalid JSON payload"})
                 return
@@ -605,20 +1359,20 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
                 build_response(self, 400, {"error": "Transcript must be a string"})
                 return
 
-            try:
-                summary = summarize_transcript(transcript)
-            except Exception as exc:
-                build_response(self, 500, {"error": str(exc)})
+            if wants_async(self):
+                job_id = submit_job(complete_summary, transcript)
+                build_response(self, 202, {"job_id": job_id, "status": "pending"})
                 return
 
-            build_response(self, 200, {"summary": summary})
+            status, result = complete_summary(transcript)
+            build_response(self, status, result)
             return
 
         if self.path == "/title":
             length = int(self.headers.get("Content-Length", "0"))
             raw = self.rfile.read(length) if length else b"{}"
             try:
-                payload = json.loads(raw.decode("utf-8"))
+                payload = _json_loads(raw)
             except json.JSONDecodeError:
                 build_response(self, 400, {"error": "Invalid JSON payload"})
                 return
@@ -628,31 +1382,36 @@ class TranscriptionHandler(BaseHTTPRequestHandler):
                 build_response(self, 400, {"error": "Transcript must be a string"})
                 return
 
-            try:
-                title = generate_title(transcript)
-            except Exception as exc:
-                build_response(self, 500, {"error": str(exc)})
+            if wants_async(self):
+                job_id = submit_job(complete_title, transcript)
+                build_response(self, 202, {"job_id": job_id, "status": "pending"})
                 return
 
-            build_response(self, 200, {"title": title})
+            status, result = complete_title(transcript)
+            build_response(self, status, result)
             return
 
-        build_response(self, 404, {"error": "Not found"})
+        self.wfile.write(NOT_FOUND_RESPONSE)
 
     def log_message(self, format: str, *args: Any) -> None:
         return
 
 
 def run_server() -> None:
-    host = os.getenv("AI_SERVER_HOST", "0.0.0.0")
-    port = int(os.getenv("AI_SERVER_PORT", "8000"))
+    host = _env("AI_SERVER_HOST", default="0.0.0.0")
+    port = int(_env("AI_SERVER_PORT", default="8000"))
     ensure_stream()
+    threading.Thread(target=warm_speech_client, daemon=True).start()
+    # One daemon thread per connection, so /health and preflights never wait behind slow requests.
     server = ThreadingHTTPServer((host, port), TranscriptionHandler)
     print(f"AI transcription server listening on http://{host}:{port}", flush=True)
     try:
         server.serve_forever()
     finally:
         server.server_close()
+        job_executor.shutdown(wait=False)
+        recognize_executor.shutdown(wait=False)
+        summary_executor.shutdown(wait=False)
         if audio_stream is not None:
             audio_stream.stop()
             audio_stream.close()
@@ -1,5 +1,9 @@
+import array
 import io
 import os
+import sys
+import wave
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import Flask, flash, redirect, render_template, request, url_for
 from dotenv import load_dotenv
@@ -9,30 +13,47 @@ from google.cloud import speech
 
 load_dotenv(override=True)
 
+
+def env(*names, default=None):
+    # First non-blank variable wins, so aliases like SUPABASE_URL/VITE_SUPABASE_URL resolve in one place.
+    for name in names:
+        value = os.getenv(name)
+        if value and value.strip():
+            return value.strip()
+    return default
+
+
 APP_ROOT = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_GOOGLE_KEY = os.path.join(APP_ROOT, "keys", "google_key.json")
-configured_google_key = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+configured_google_key = env("GOOGLE_APPLICATION_CREDENTIALS")
 if configured_google_key and not os.path.isfile(configured_google_key):
     configured_google_key = None
 
 if not configured_google_key and os.path.isfile(DEFAULT_GOOGLE_KEY):
     os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = DEFAULT_GOOGLE_KEY
 
-BUCKET = os.getenv("SUPABASE_BUCKET", "audio")
-SPEECH_FORCE_LONG_RUNNING = os.getenv("SPEECH_FORCE_LONG_RUNNING", "true").lower() not in (
+BUCKET = env("SUPABASE_BUCKET", default="audio")
+SPEECH_FORCE_LONG_RUNNING = env("SPEECH_FORCE_LONG_RUNNING", default="true").lower() not in (
     "0",
     "false",
     "no",
 )
+SPEECH_CHUNK_SECONDS = int(env("SPEECH_CHUNK_SECONDS", default="55"))
+# Segment cuts move back by up to this many seconds to land in a pause instead of mid-word.
+SPEECH_SPLIT_SEARCH_SECONDS = float(env("SPEECH_SPLIT_SEARCH_SECONDS", default="5"))
+SPEECH_WORKERS = int(env("SPEECH_WORKERS", default="4"))
+# Synchronous recognize rejects inline audio over 10 MB; stay a little under it.
+SPEECH_INLINE_MAX_BYTES = 10_000_000
+
+_speech_client = None
+_gemini_model = None
+# Shared across requests so long WAVs fan out without spawning threads per upload.
+speech_executor = ThreadPoolExecutor(max_workers=max(1, SPEECH_WORKERS))
 
 
 def get_supabase_client():
-    url = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
-    key = (
-        os.getenv("SUPABASE_SERVICE_ROLE_KEY")
-        or os.getenv("SUPABASE_ANON_KEY")
-        or os.getenv("VITE_SUPABASE_ANON_KEY")
-    )
+    url = env("SUPABASE_URL", "VITE_SUPABASE_URL")
+    key = env("SUPABASE_SERVICE_ROLE_KEY", "SUPABASE_ANON_KEY", "VITE_SUPABASE_ANON_KEY")
     if not url or not key:
         raise RuntimeError(
             "Missing SUPABASE_URL and SUPABASE_ANON_KEY (or SUPABASE_SERVICE_ROLE_KEY)."
@@ -40,13 +61,26 @@ def get_supabase_client():
     return create_client(url, key)
 
 
+def get_speech_client():
+    # Reuse one client so each transcription skips credential loading and channel setup.
+    global _speech_client
+    if _speech_client is None:
+        _speech_client = speech.SpeechClient()
+    return _speech_client
+
+
 def get_gemini_model():
-    api_key = os.getenv("GOOGLE_SUMMARY_KEY") or os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_AI_API_KEY")
+    # Configure and build the model once; later summaries reuse it.
+    global _gemini_model
+    if _gemini_model is not None:
+        return _gemini_model
+    api_key = env("GOOGLE_SUMMARY_KEY", "GEMINI_API_KEY", "GOOGLE_AI_API_KEY")
     if not api_key:
         raise RuntimeError("Missing GOOGLE_SUMMARY_KEY (or GEMINI_API_KEY / GOOGLE_AI_API_KEY).")
     genai.configure(api_key=api_key)
-    model_name = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
-    return genai.GenerativeModel(model_name)
+    model_name = env("GEMINI_MODEL", default="gemini-2.5-flash")
+    _gemini_model = genai.GenerativeModel(model_name)
+    return _gemini_model
 
 
 def summarize_transcript(text):
@@ -69,7 +103,7 @@ def summarize_transcript(text):
 
 
 def build_public_url(file_name):
-    base_url = os.getenv("SUPABASE_URL") or os.getenv("VITE_SUPABASE_URL")
+    base_url = env("SUPABASE_URL", "VITE_SUPABASE_URL")
     if not base_url:
         return None
     return f"{base_url.rstrip('/')}/storage/v1/object/public/{BUCKET}/{file_name}"
@@ -96,7 +130,7 @@ def list_audio_files(supabase_client):
 def detect_config(file_name, audio_bytes):
     ext = os.path.splitext(file_name)[1].lower()
     config_kwargs = {
-        "language_code": os.getenv("TRANSCRIBE_LANGUAGE", "en-US"),
+        "language_code": env("TRANSCRIBE_LANGUAGE", default="en-US"),
         "enable_automatic_punctuation": True,
     }
 
@@ -114,8 +148,6 @@ def detect_config(file_name, audio_bytes):
 
     if ext == ".wav":
         try:
-            import wave
-
             with wave.open(io.BytesIO(audio_bytes), "rb") as wave_file:
                 config_kwargs["sample_rate_hertz"] = wave_file.getframerate()
         except Exception:
@@ -131,8 +163,77 @@ def build_transcript(response):
     return transcript or "(No speech detected.)"
 
 
+def quietest_frame(samples, start, end, frame):
+    # Start of the 20 ms frame with the least energy in samples[start:end]; end when no frame fits.
+    best, best_energy = end, None
+    for pos in range(start, end - frame + 1, frame):
+        energy = sum(map(abs, samples[pos : pos + frame]))
+        if best_energy is None or energy < best_energy:
+            best, best_energy = pos, energy
+    return best
+
+
+def split_wav(audio_bytes, chunk_seconds):
+    # Returns (rate, channels, PCM segments) for 16-bit WAVs, or None when the file can't be split.
+    try:
+        with wave.open(io.BytesIO(audio_bytes), "rb") as wave_file:
+            if wave_file.getsampwidth() != 2:
+                return None
+            rate = wave_file.getframerate()
+            channels = wave_file.getnchannels()
+            frames = wave_file.readframes(wave_file.getnframes())
+    except Exception:
+        return None
+
+    samples = array.array("h")
+    samples.frombytes(frames[: len(frames) // 2 * 2])
+    if sys.byteorder == "big":
+        samples.byteswap()
+
+    # All offsets are whole multiples of channels, so cuts never land inside an interleaved frame.
+    frame = max(1, rate // 50) * channels
+    # High-rate stereo can pass the inline size limit before chunk_seconds (48 kHz stereo at 55 s is 10.56 MB).
+    chunk = min(rate * max(1, chunk_seconds), SPEECH_INLINE_MAX_BYTES // (2 * channels)) * channels
+    search = int(rate * SPEECH_SPLIT_SEARCH_SECONDS) * channels
+    segments = []
+    start = 0
+    while len(samples) - start > chunk:
+        boundary = start + chunk
+        cut = quietest_frame(samples, max(start + frame, boundary - search), boundary, frame)
+        segments.append(frames[start * 2 : cut * 2])
+        start = cut
+    segments.append(frames[start * 2 :])
+    return rate, channels, segments
+
+
+def transcribe_wav_segments(rate, channels, segments):
+    speech_client = get_speech_client()
+    config = speech.RecognitionConfig(
+        encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+        sample_rate_hertz=rate,
+        audio_channel_count=channels,
+        language_code=env("TRANSCRIBE_LANGUAGE", default="en-US"),
+        enable_automatic_punctuation=True,
+    )
+
+    def recognize_segment(segment):
+        response = speech_client.recognize(config=config, audio=speech.RecognitionAudio(content=segment))
+        return " ".join(result.alternatives[0].transcript for result in response.results).strip()
+
+    # Segments run concurrently; map() keeps them in order.
+    transcript = " ".join(text for text in speech_executor.map(recognize_segment, segments) if text)
+    return transcript or "(No speech detected.)"
+
+
 def transcribe_audio(file_name, audio_bytes):
-    speech_client = speech.SpeechClient()
+    # Synchronous recognize only takes about a minute of audio, so without long-running mode
+    # long WAVs are split at pauses and the segments are recognized in parallel.
+    if not SPEECH_FORCE_LONG_RUNNING and os.path.splitext(file_name)[1].lower() == ".wav":
+        split = split_wav(audio_bytes, SPEECH_CHUNK_SECONDS)
+        if split and len(split[2]) > 1:
+            return transcribe_wav_segments(*split)
+
+    speech_client = get_speech_client()
     config = detect_config(file_name, audio_bytes)
     audio = speech.RecognitionAudio(content=audio_bytes)
 
@@ -140,14 +241,14 @@ def transcribe_audio(file_name, audio_bytes):
         response = speech_client.recognize(config=config, audio=audio)
         return build_transcript(response)
 
-    timeout_seconds = int(os.getenv("SPEECH_LONG_RUNNING_TIMEOUT", "600"))
+    timeout_seconds = int(env("SPEECH_LONG_RUNNING_TIMEOUT", default="600"))
     operation = speech_client.long_running_recognize(config=config, audio=audio)
     response = operation.result(timeout=timeout_seconds)
     return build_transcript(response)
 
 
 app = Flask(__name__)
-app.secret_key = os.getenv("FLASK_SECRET_KEY", "change-me")
+app.secret_key = env("FLASK_SECRET_KEY", default="change-me")
 
 
 @app.get("/")